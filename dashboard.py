@@ -1,11 +1,46 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
+import glob
+import hashlib
+import importlib
+import logging
+import os
 import re
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 
+# Import modul berat (plotting) hanya saat benar-benar dipakai
+class LazyModule:
+    """Proxy modul: import dilakukan saat atribut pertama kali diakses"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+plt = LazyModule('matplotlib.pyplot')
+
+# Logger sendiri (root logger server Streamlit tidak diubah)
+logger = logging.getLogger('dashboard')
+if not logger.handlers:
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    logger.addHandler(_log_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
 # Page configuration
 st.set_page_config(
     page_title="Dashboard Call Center 112",
@@ -34,6 +69,55 @@ PATH_2024 = "LAPORAN INSIDEN CALL CENTER 112 TAHUN 2024.xlsx"
 PATH_2025 = "LAPORAN INSIDEN CALLCENTER 112 TAHUN 2025.xlsx"
 # ===============================
 
+# Hasil proses dataset disimpan di disk per versi dataset, agar restart
+# tidak perlu parse Excel lagi. Naikkan PROCESSING_VERSION jika logika
+# preprocessing berubah
+DATASET_CACHE_DIR = ".dataset_cache"
+PROCESSING_VERSION = 1
+
+# Index deduplikasi (baris hasil parse & hash key per file), disimpan
+# bersama dataset. Naikkan DEDUP_NORMALIZATION_VERSION jika normalisasi
+# kolom / key berubah agar index lama tidak dipakai
+DEDUP_INDEX_PATH = os.path.join(DATASET_CACHE_DIR, "dedup_index.pkl")
+DEDUP_KEY_COLUMNS = ['UID', 'WAKTU LAPOR', 'TIPE LAPORAN', 'AGENT L1']
+DEDUP_NORMALIZATION_VERSION = 2
+
+# Label opsi filter untuk data tanpa kategori / lokasi
+NO_CATEGORY_OPTION = '[Tanpa Kategori (Ghost/Prank)]'
+NO_LOCATION_OPTION = '[Tanpa Lokasi (Ghost/Prank)]'
+
+# Kolom flag dan label tampilannya di tabel detail
+FLAG_COLUMNS = {
+    'ghost_call': 'Ghost Calls',
+    'prank_call': 'Prank Calls',
+    'short_call': 'Short Calls',
+    'fake_location': 'Lokasi Palsu',
+}
+
+# Format export: label -> (ekstensi, MIME type)
+EXPORT_FORMATS = {
+    'CSV': ('.csv', 'text/csv'),
+    'Parquet': ('.parquet', 'application/octet-stream'),
+    'Excel (XLSX)': ('.xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
+EXPORT_CHUNK_SIZE = 50_000
+ALL_KECAMATAN_OPTION = '[Semua Kecamatan]'
+
+# Batas memori cache hasil filter (dibagi antar sesi)
+FILTER_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Versi dataset: berubah jika file sumber diganti / dimodifikasi
+def get_dataset_version(*paths):
+    """Return tuple (path, mtime, size) untuk tiap file sumber"""
+    version = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            version.append((path, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            version.append((path, None, None))
+    return tuple(version)
+
 # Helper function untuk parsing durasi
 def parse_duration_to_seconds(duration_str):
     """
@@ -60,28 +144,210 @@ def parse_duration_to_seconds(duration_str):
     
     return np.nan
 
+# Parse satu file sumber (bagian ingestion yang bisa di-cache per file)
+def parse_source_file(path, source):
+    """
+    Load 1 file Excel lalu normalisasi kolom, WAKTU LAPOR, TIPE LAPORAN
+    dan durasi pengerjaan
+    """
+    rows = pd.read_excel(path)
+    
+    # Tambah kolom source
+    rows['source'] = source
+    
+    # Bersihkan nama kolom
+    rows.columns = [c.strip() for c in rows.columns]
+    
+    # Konversi waktu lapor ke datetime
+    rows['WAKTU LAPOR'] = pd.to_datetime(rows['WAKTU LAPOR'], errors='coerce')
+    
+    # Bersihkan tipe laporan (PENTING: data menggunakan lowercase!)
+    if 'TIPE LAPORAN' in rows.columns:
+        rows['TIPE LAPORAN'] = rows['TIPE LAPORAN'].astype(str).str.strip().str.lower()
+    
+    # Parse durasi pengerjaan
+    if 'DURASI PENGERJAAN' in rows.columns:
+        rows['duration_seconds'] = rows['DURASI PENGERJAAN'].apply(parse_duration_to_seconds)
+    
+    return rows
+
+# Hash key ternormalisasi untuk deteksi duplikat
+def build_dedup_hashes(df, key_columns):
+    """
+    Return array uint64: satu hash per baris dari key_columns.
+    UID & agent dinormalisasi (strip, '123.0' -> '123', agent uppercase);
+    nilai kosong tetap kosong (tidak menjadi 'nan'). WAKTU LAPOR diseragamkan
+    ke unit ns, karena hash datetime64[us] & [ns] untuk waktu yang sama berbeda
+    """
+    key = pd.DataFrame(index=df.index)
+    for c in key_columns:
+        if c == 'UID':
+            key[c] = df[c].astype(str).str.strip().str.replace(r'\.0$', '', regex=True).where(df[c].notna())
+        elif c == 'AGENT L1':
+            key[c] = df[c].astype(str).str.strip().str.upper().where(df[c].notna())
+        elif c == 'WAKTU LAPOR':
+            key[c] = df[c].dt.as_unit('ns')
+        else:
+            key[c] = df[c]
+    return pd.util.hash_pandas_object(key, index=False).to_numpy()
+
+def empty_dedup_index():
+    return {'normalization_version': DEDUP_NORMALIZATION_VERSION, 'files': {}}
+
+def load_dedup_index(path=DEDUP_INDEX_PATH):
+    """Load index dedup tersimpan; index kosong jika belum ada, rusak, atau versi normalisasi beda"""
+    try:
+        index = pd.read_pickle(path)
+    except Exception:
+        return empty_dedup_index()
+
+    if index.get('normalization_version') != DEDUP_NORMALIZATION_VERSION:
+        logger.info("Index dedup dibuat dengan normalisasi lama, dibangun ulang")
+        return empty_dedup_index()
+    return index
+
+def source_rows_path(path):
+    """File cache baris hasil parse untuk satu file sumber"""
+    digest = hashlib.sha1(path.encode()).hexdigest()[:16]
+    return os.path.join(DATASET_CACHE_DIR, f"rows_{digest}.pkl")
+
+def load_and_deduplicate(source_paths):
+    """
+    Load semua file sumber lalu buang laporan duplikat antar & dalam file
+    (keep first, urutan file = urutan prioritas).
+
+    Per file, index menyimpan versi file (mtime & size), path baris hasil
+    parse, dan hash key. File yang tidak berubah tidak di-parse & di-hash
+    ulang; hanya file baru / yang diexport ulang yang diproses.
+    Baris dengan UID kosong atau WAKTU LAPOR NaT tidak pernah dianggap duplikat.
+    Return (df tanpa duplikat, {path: jumlah duplikat dibuang})
+    """
+    index = load_dedup_index()
+    files = {}
+    frames = []
+    index_changed = False
+
+    for source, path in source_paths.items():
+        version = get_dataset_version(path)[0][1:]
+        stored = index['files'].get(path)
+
+        rows = None
+        if stored is not None and stored['version'] == version:
+            try:
+                rows = pd.read_pickle(stored['rows_path'])
+            except Exception:
+                rows = None
+
+        if rows is None:
+            rows = parse_source_file(path, source)
+            stored = {'version': version, 'rows_path': source_rows_path(path), 'key_columns': None, 'hashes': None}
+            write_pickle_atomic(stored['rows_path'], rows)
+            index_changed = True
+
+        frames.append(rows)
+        files[path] = dict(stored)
+
+    # Gabung dataset
+    df = pd.concat(frames, ignore_index=True)
+    key_columns = [c for c in DEDUP_KEY_COLUMNS if c in df.columns]
+
+    # Hash per file: pakai ulang dari index jika key sama, hitung jika belum ada
+    hashes = np.empty(len(df), dtype=np.uint64)
+    bounds = {}
+    offset = 0
+    for (path, entry), rows in zip(files.items(), frames):
+        end = offset + len(rows)
+        if entry['key_columns'] != key_columns or entry['hashes'] is None or len(entry['hashes']) != len(rows):
+            entry['key_columns'] = key_columns
+            entry['hashes'] = build_dedup_hashes(df.iloc[offset:end], key_columns)
+            index_changed = True
+        hashes[offset:end] = entry['hashes']
+        bounds[path] = (offset, end)
+        offset = end
+
+    # Satu pass hash table atas seluruh baris; key tidak lengkap dikecualikan
+    valid_key = df['WAKTU LAPOR'].notna().to_numpy().copy()
+    if 'UID' in df.columns:
+        valid_key &= df['UID'].notna().to_numpy()
+    else:
+        valid_key[:] = False
+    duplicated = pd.Series(hashes).duplicated().to_numpy() & valid_key
+    report = {path: int(duplicated[start:end].sum()) for path, (start, end) in bounds.items()}
+
+    # Simpan index untuk load berikutnya
+    if index_changed:
+        write_pickle_atomic(DEDUP_INDEX_PATH, {'normalization_version': DEDUP_NORMALIZATION_VERSION, 'files': files})
+
+    return df[~duplicated].reset_index(drop=True), report
+
+# Cache hasil proses dataset di disk
+def processed_cache_path(dataset_version):
+    """Path file cache untuk versi dataset ini, None jika ada file sumber yang hilang"""
+    if not dataset_version or any(mtime is None for _, mtime, _ in dataset_version):
+        return None
+    digest = hashlib.sha1(
+        repr((PROCESSING_VERSION, DEDUP_NORMALIZATION_VERSION, dataset_version)).encode()
+    ).hexdigest()[:16]
+    return os.path.join(DATASET_CACHE_DIR, f"processed_{digest}.pkl")
+
+def read_processed_cache(path):
+    """Return (df, dedup_report) dari disk, atau None jika belum ada / rusak"""
+    if path is None or not os.path.exists(path):
+        return None
+    try:
+        return pd.read_pickle(path)
+    except Exception as e:
+        logger.warning("Cache dataset %s tidak bisa dibaca: %s", path, e)
+        return None
+
+def write_pickle_atomic(path, obj):
+    """Tulis pickle via file sementara + rename; return False jika gagal"""
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        pd.to_pickle(obj, tmp_path)
+        os.replace(tmp_path, path)
+        return True
+    except OSError as e:
+        # Folder read-only: tetap jalan tanpa cache disk
+        logger.warning("Cache %s tidak bisa disimpan: %s", path, e)
+        return False
+
+def write_processed_cache(path, processed):
+    """Simpan (df, dedup_report) secara atomik, hapus cache versi lama"""
+    if path is None or not write_pickle_atomic(path, processed):
+        return
+    try:
+        for old_path in glob.glob(os.path.join(DATASET_CACHE_DIR, 'processed_*.pkl')):
+            if old_path != path:
+                os.remove(old_path)
+    except OSError as e:
+        logger.warning("Cache dataset lama tidak bisa dihapus: %s", e)
+
 # Cache data loading
 @st.cache_data
-def load_and_process_data(path_2024, path_2025):
-    """Load dan preprocess data dari 2 file Excel"""
+def load_and_process_data(path_2024, path_2025, dataset_version=None):
+    """
+    Load dan preprocess data dari 2 file Excel.
+    Hasil disimpan di disk per dataset_version; jika file sumber tidak
+    berubah, restart cukup membaca cache tersebut.
+    Return (df, laporan duplikat per file, error)
+    """
     
     try:
-        # Load data
-        df24 = pd.read_excel(path_2024)
-        df25 = pd.read_excel(path_2025)
+        cache_path = processed_cache_path(dataset_version)
+        cached = read_processed_cache(cache_path)
+        if cached is not None:
+            df, dedup_report = cached
+            return df, dedup_report, None
         
-        # Tambah kolom source
-        df24['source'] = '2024'
-        df25['source'] = '2025'
+        # Load data per file + DEDUPLIKASI
+        # Export yang overlap (batas tahun / bulan diexport ulang) menghasilkan
+        # laporan ganda; dibuang sebelum fitur turunan & deteksi spam
+        df, dedup_report = load_and_deduplicate({'2024': path_2024, '2025': path_2025})
         
-        # Gabung dataset
-        df = pd.concat([df24, df25], ignore_index=True)
-        
-        # Bersihkan nama kolom
-        df.columns = [c.strip() for c in df.columns]
-        
-        # Konversi waktu lapor ke datetime
-        df['WAKTU LAPOR'] = pd.to_datetime(df['WAKTU LAPOR'], errors='coerce')
+        if 'TIPE LAPORAN' not in df.columns:
+            df['TIPE LAPORAN'] = 'unknown'
         
         # Buat fitur turunan dari waktu
         df['date'] = df['WAKTU LAPOR'].dt.date
@@ -92,18 +358,10 @@ def load_and_process_data(path_2024, path_2025):
         df['hour'] = df['WAKTU LAPOR'].dt.hour
         df['weekday'] = df['WAKTU LAPOR'].dt.day_name()
         
-        # Parse durasi pengerjaan
-        if 'DURASI PENGERJAAN' in df.columns:
-            df['duration_seconds'] = df['DURASI PENGERJAAN'].apply(parse_duration_to_seconds)
-        else:
+        # Durasi sudah di-parse per file
+        if 'duration_seconds' not in df.columns:
             df['duration_seconds'] = np.nan
         
-        # Bersihkan tipe laporan (PENTING: data menggunakan lowercase!)
-        if 'TIPE LAPORAN' in df.columns:
-            df['TIPE LAPORAN'] = df['TIPE LAPORAN'].astype(str).str.strip().str.lower()
-        else:
-            df['TIPE LAPORAN'] = 'unknown'
-        
         # Cleaning kecamatan & kelurahan
         for c in ['KECAMATAN', 'KELURAHAN']:
             if c in df.columns:
@@ -142,22 +400,484 @@ def load_and_process_data(path_2024, path_2025):
         else:
             df['rapid_repeat'] = False
         
-        return df, None
+        write_processed_cache(cache_path, (df, dedup_report))
+        return df, dedup_report, None
     
     except FileNotFoundError as e:
-        return None, f"❌ File tidak ditemukan: {e}"
+        return None, None, f"❌ File tidak ditemukan: {e}"
     except Exception as e:
-        return None, f"❌ Error saat memuat data: {str(e)}"
+        return None, None, f"❌ Error saat memuat data: {str(e)}"
+
+# Terapkan filter sidebar (dipakai untuk data baris maupun rollup lokasi)
+def apply_filters(df, selected_years, selected_categories, selected_kecamatans):
+    """
+    Filter berdasarkan kolom 'source', 'KATEGORI' dan 'KECAMATAN'.
+    Pilihan kosong = tampilkan semua
+    """
+    if selected_years:
+        df = df[df['source'].isin(selected_years)]
+
+    # Filter kategori
+    if selected_categories and len(selected_categories) > 0:
+        # Jika user pilih "[Tanpa Kategori]", ambil data dengan kategori "-"
+        if NO_CATEGORY_OPTION in selected_categories:
+            # Ambil kategori normal yang dipilih
+            normal_cats = [c for c in selected_categories if c != NO_CATEGORY_OPTION]
+            # Filter: kategori "-" ATAU kategori yang dipilih
+            df = df[
+                (df['KATEGORI'].isin(['-', '']) | df['KATEGORI'].isna()) |
+                (df['KATEGORI'].isin(normal_cats))
+            ]
+        else:
+            # Filter normal
+            df = df[df['KATEGORI'].isin(selected_categories)]
+
+    # Filter kecamatan
+    if selected_kecamatans and len(selected_kecamatans) > 0:
+        # Jika user pilih "[Tanpa Lokasi]", ambil data dengan kecamatan "-"
+        if NO_LOCATION_OPTION in selected_kecamatans:
+            # Ambil kecamatan normal yang dipilih
+            normal_kecs = [k for k in selected_kecamatans if k != NO_LOCATION_OPTION]
+            # Filter: kecamatan "-" ATAU kecamatan yang dipilih
+            df = df[
+                (df['KECAMATAN'].isin(['-', '']) | df['KECAMATAN'].isna()) |
+                (df['KECAMATAN'].isin(normal_kecs))
+            ]
+        else:
+            # Filter normal
+            df = df[df['KECAMATAN'].isin(selected_kecamatans)]
+
+    return df
+
+# Index lokasi hierarkis: kecamatan → kelurahan
+@st.cache_data
+def build_location_index(_df, dataset_version):
+    """
+    Precompute rollup per lokasi, sekali per versi dataset.
+
+    Return dict:
+    - 'leaves': total & jumlah flag per (KECAMATAN, KELURAHAN, source, KATEGORI),
+      cukup kecil untuk difilter ulang tiap rerun tanpa scan baris
+    - 'kecamatan': total per kecamatan (tanpa filter)
+    - 'kelurahan': {kecamatan: total per kelurahan} (tanpa filter)
+
+    'Total Laporan' = jumlah UID (sama seperti tabel sebelumnya)
+    """
+    df_valid_kec = _df[(_df['KECAMATAN'].notna()) & (_df['KECAMATAN'] != '-')]
+
+    leaf_keys = ['KECAMATAN', 'KELURAHAN', 'source', 'KATEGORI']
+    for c in leaf_keys:
+        if c not in df_valid_kec.columns:
+            df_valid_kec = df_valid_kec.assign(**{c: pd.NA})
+
+    flag_cols = list(FLAG_COLUMNS)
+    grouped = df_valid_kec.groupby(leaf_keys, dropna=False, observed=True)
+    leaves = grouped[flag_cols].sum().astype(int)
+    if 'UID' in df_valid_kec.columns:
+        leaves.insert(0, 'Total Laporan', grouped['UID'].count())
+    else:
+        leaves.insert(0, 'Total Laporan', grouped.size())
+    leaves = leaves.rename(columns=FLAG_COLUMNS).reset_index()
+
+    return {
+        'leaves': leaves,
+        'kecamatan': rollup_locations(leaves, ['KECAMATAN']),
+        'kelurahan': rollup_kelurahan(leaves),
+    }
+
+def rollup_locations(leaves, level):
+    """Jumlahkan rollup leaf ke level lokasi tertentu, urut dari total terbesar"""
+    value_cols = ['Total Laporan'] + list(FLAG_COLUMNS.values())
+    rollup = leaves.groupby(level, dropna=False)[value_cols].sum()
+    return rollup.sort_values('Total Laporan', ascending=False)
+
+def rollup_kelurahan(leaves):
+    """Rollup per kelurahan, dipecah per kecamatan: {kecamatan: DataFrame}"""
+    rollup = rollup_locations(leaves, ['KECAMATAN', 'KELURAHAN'])
+    breakdown = {}
+    for kecamatan, frame in rollup.groupby(level='KECAMATAN', sort=False):
+        frame = frame.droplevel('KECAMATAN')
+        frame.index = frame.index.fillna('(Tanpa Kelurahan)')
+        breakdown[kecamatan] = frame
+    return breakdown
+
+# Cache hasil filter yang dibagi semua sesi dalam satu proses
+class FilterResultCache:
+    """
+    LRU cache {key filter kanonik: view hasil filter + agregat},
+    dibatasi total ukuran (byte). Aman dipakai dari banyak thread sesi.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (view, nbytes)
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self._inflight = {}  # key -> lock selama view sedang dihitung
+
+    def _lookup(self, key):
+        """Ambil view & tandai baru dipakai (tanpa hitung hit/miss; lock harus dipegang)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, view, nbytes):
+        with self._lock:
+            if key in self._entries:
+                self._nbytes -= self._entries.pop(key)[1]
+
+            # Entry yang lebih besar dari batas tidak disimpan
+            if nbytes > self.max_bytes:
+                return
+
+            self._entries[key] = (view, nbytes)
+            self._nbytes += nbytes
+
+            # Evict entry yang paling lama tidak dipakai
+            while self._nbytes > self.max_bytes:
+                _, (_, evicted_nbytes) = self._entries.popitem(last=False)
+                self._nbytes -= evicted_nbytes
+
+    def get_or_compute(self, key, compute, estimate_nbytes):
+        """
+        Ambil view dari cache, atau hitung lalu simpan.
+        Sesi lain yang meminta key yang sama menunggu hasil yang sedang
+        dihitung, bukan menghitung ulang (mis. saat banyak sesi reconnect)
+        """
+        with self._lock:
+            view = self._lookup(key)
+            if view is not None:
+                self.hits += 1
+                return view
+            key_lock = self._inflight.setdefault(key, threading.Lock())
+
+        try:
+            with key_lock:
+                # Cek ulang: mungkin sudah selesai dihitung thread lain (= hit)
+                with self._lock:
+                    view = self._lookup(key)
+                    if view is not None:
+                        self.hits += 1
+                        return view
+                    self.misses += 1
+
+                view = compute()
+                self.put(key, view, estimate_nbytes(view))
+                return view
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'nbytes': self._nbytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+@st.cache_resource
+def get_filter_cache():
+    """Satu instance FilterResultCache per proses server"""
+    return FilterResultCache(FILTER_CACHE_MAX_BYTES)
+
+def estimate_view_nbytes(view):
+    """Ukuran entry cache: array posisi baris + semua agregat"""
+    nbytes = 0 if view['positions'] is None else view['positions'].nbytes
+    for value in view.values():
+        frames = value.values() if isinstance(value, dict) else [value]
+        for frame in frames:
+            if isinstance(frame, (pd.Series, pd.DataFrame)):
+                nbytes += int(np.sum(frame.memory_usage(deep=True)))
+    return nbytes
+
+def rows_for_view(df, view):
+    """Bangun ulang df_filtered dari posisi baris yang disimpan di view"""
+    if view['positions'] is None:
+        return df
+    return df.take(view['positions'])
+
+# Key kanonik pilihan sidebar
+def canonical_filter_key(all_years, selected_years, selected_categories, selected_kecamatans, dataset_version):
+    """
+    Urutkan pilihan agar urutan klik tidak mempengaruhi key.
+    Memilih semua tahun sama dengan tanpa filter tahun
+    """
+    years_key = tuple(sorted(selected_years)) if set(selected_years) != set(all_years) else ()
+    return (
+        years_key,
+        tuple(sorted(selected_categories)),
+        tuple(sorted(selected_kecamatans)),
+        dataset_version,
+    )
+
+# Hitung posisi baris hasil filter beserta semua agregat yang dipakai tab
+def compute_filter_view(df, filter_key):
+    """
+    Return dict berisi posisi baris (int32, None = semua baris) dan agregat.
+    Baris tidak disalin ke cache; df_filtered dibangun ulang dengan rows_for_view
+    """
+    selected_years, selected_categories, selected_kecamatans, dataset_version = filter_key
+    df_filtered = apply_filters(df, list(selected_years), list(selected_categories), list(selected_kecamatans))
+
+    if len(df_filtered) == len(df):
+        positions = None
+    else:
+        positions = df.index.get_indexer(df_filtered.index).astype(np.int32)
+
+    view = {
+        'positions': positions,
+        'total': len(df_filtered),
+        'flag_counts': {
+            c: int(df_filtered[c].sum()) for c in list(FLAG_COLUMNS) + ['rapid_repeat']
+        },
+        'tipe_counts': df_filtered['TIPE LAPORAN'].value_counts().head(10),
+        'weekday_counts': df_filtered['weekday'].value_counts(),
+    }
+
+    if 'KATEGORI' in df_filtered.columns:
+        view['category_counts'] = df_filtered['KATEGORI'].value_counts().head(10)
+
+    if 'KECAMATAN' in df_filtered.columns:
+        # Semua kecamatan (untuk opsi drill-down); chart memakai top 15
+        view['kecamatan_counts'] = df_filtered['KECAMATAN'].value_counts()
+
+        # Rollup lokasi: filter leaf (bukan baris data), lalu jumlahkan per node
+        location_index = build_location_index(df, dataset_version)
+        if selected_years or selected_categories or selected_kecamatans:
+            leaves = apply_filters(location_index['leaves'], list(selected_years), list(selected_categories), list(selected_kecamatans))
+            view['kecamatan_rollup'] = rollup_locations(leaves, ['KECAMATAN'])
+            view['kelurahan_rollup'] = rollup_kelurahan(leaves)
+        else:
+            view['kecamatan_rollup'] = location_index['kecamatan']
+            view['kelurahan_rollup'] = location_index['kelurahan']
+
+    if 'AGENT L1' in df_filtered.columns:
+        view['agent_counts'] = df_filtered['AGENT L1'].value_counts().head(15)
+        view['ghost_by_agent'] = df_filtered.loc[df_filtered['ghost_call'], 'AGENT L1'].value_counts().head(10)
+        view['prank_by_agent'] = df_filtered.loc[df_filtered['prank_call'], 'AGENT L1'].value_counts().head(10)
+
+        agent_detail = df_filtered.groupby('AGENT L1').agg({
+            'UID': 'count',
+            'ghost_call': 'sum',
+            'prank_call': 'sum',
+            'short_call': 'sum',
+            'duration_seconds': 'mean'
+        }).rename(columns={
+            'UID': 'Total Laporan',
+            'ghost_call': 'Ghost Calls',
+            'prank_call': 'Prank Calls',
+            'short_call': 'Short Calls',
+            'duration_seconds': 'Rata-rata Durasi (detik)'
+        }).sort_values('Total Laporan', ascending=False).head(20)
+
+        # Convert to int kecuali durasi
+        for col in ['Ghost Calls', 'Prank Calls', 'Short Calls']:
+            agent_detail[col] = agent_detail[col].astype(int)
+
+        # Format durasi
+        agent_detail['Rata-rata Durasi (detik)'] = agent_detail['Rata-rata Durasi (detik)'].round(2)
+        view['agent_detail'] = agent_detail
+
+    return view
+
+# Agregat deret waktu (tidak tergantung filter)
+@st.cache_data
+def compute_time_series(_df, dataset_version):
+    """Deret waktu per tahun untuk tab Pola Waktu & Ghost/Prank, sekali per versi dataset"""
+    series = {}
+    for year in ['2024', '2025']:
+        df_year = _df[_df['source'] == year]
+        series[f'monthly_{year}'] = df_year['ym'].value_counts().sort_index()
+        series[f'daily_{year}'] = df_year['date'].value_counts().sort_index()
+        series[f'hourly_{year}'] = df_year['hour'].value_counts().sort_index()
+
+    series['ghost_monthly'] = _df[_df['ghost_call']].groupby('ym').size()
+    series['prank_monthly'] = _df[_df['prank_call']].groupby('ym').size()
+    return series
+
+# Prewarm sebelum request pertama: dijalankan dari CLI saat container start
+# (python dashboard.py --prewarm), membangun cache dataset di disk
+def prewarm_dataset():
+    """Load & proses dataset (atau validasi cache disk), return exit code"""
+    start = time.perf_counter()
+    dataset_version = get_dataset_version(PATH_2024, PATH_2025)
+    df, _, error = load_and_process_data(PATH_2024, PATH_2025, dataset_version)
+    if error:
+        logger.error("Prewarm gagal: %s", error)
+        return 1
+
+    logger.info("Prewarm selesai: %s laporan dalam %.2fs", f"{len(df):,}", time.perf_counter() - start)
+    return 0
+
+# Prewarm di proses server: view default (metrik Overview), chart default
+# (deret waktu) & import matplotlib, berjalan di background
+def prewarm(df, dataset_version, years):
+    """Hitung metrik Overview (view tanpa filter), deret waktu, dan import matplotlib"""
+    default_key = canonical_filter_key(years, years, [], [], dataset_version)
+    get_filter_cache().get_or_compute(
+        default_key,
+        lambda: compute_filter_view(df, default_key),
+        estimate_view_nbytes
+    )
+    compute_time_series(df, dataset_version)
+    plt.load()
+
+@st.cache_resource
+def start_prewarm(_df, dataset_version, years):
+    """Jalankan prewarm sekali per versi dataset, tanpa memblokir sesi"""
+    thread = threading.Thread(target=prewarm, args=(_df, dataset_version, years), daemon=True)
+    thread.start()
+    return thread
+
+# Pengukuran waktu startup
+def get_process_start_time():
+    """
+    Waktu (epoch) proses server dibuat, dari /proc (Linux).
+    Return None jika tidak tersedia
+    """
+    try:
+        with open('/proc/self/stat') as f:
+            # Field setelah nama proses "(...)": index 19 = starttime (clock tick sejak boot)
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return time.time() - uptime + start_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+@st.cache_resource
+def get_startup_clock():
+    """Waktu start proses (atau script run pertama jika tidak tersedia) & time-to-first-metric"""
+    process_start = get_process_start_time()
+    if process_start is not None:
+        return {'start': process_start, 'label': 'sejak proses start', 'first_metric': None}
+    return {'start': time.time(), 'label': 'sejak render pertama', 'first_metric': None}
+
+def record_first_metric(run_start):
+    """Catat time-to-first-metric (proses & rerun ini), tampilkan di sidebar"""
+    clock = get_startup_clock()
+    if clock['first_metric'] is None:
+        clock['first_metric'] = time.time() - clock['start']
+        logger.info("Time-to-first-metric (%s): %.2fs", clock['label'], clock['first_metric'])
+
+    st.sidebar.caption(
+        f"⏱️ Time-to-first-metric: {clock['first_metric']:.2f}s {clock['label']} · "
+        f"rerun ini {time.perf_counter() - run_start:.2f}s"
+    )
+
+# Iterasi data per chunk (slice, tanpa copy seluruh frame)
+def iter_export_chunks(df, chunk_size=EXPORT_CHUNK_SIZE):
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size]
+
+# Schema Parquet eksplisit (kolom object/Period -> string)
+def build_parquet_schema(df):
+    """
+    Return (schema, string_cols). Kolom dari Excel sering berisi campuran
+    int & str (mis. UID), jadi tidak bisa di-infer pyarrow
+    """
+    import pyarrow as pa
+
+    fields = []
+    string_cols = []
+    for c in df.columns:
+        dtype = df[c].dtype
+        arrow_type = None
+        if dtype != object and not isinstance(dtype, pd.PeriodDtype):
+            try:
+                arrow_type = pa.from_numpy_dtype(dtype)
+            except (TypeError, NotImplementedError, pa.ArrowException):
+                arrow_type = None
+
+        if arrow_type is None:
+            arrow_type = pa.string()
+            string_cols.append(c)
+        fields.append(pa.field(str(c), arrow_type))
+
+    return pa.schema(fields), string_cols
+
+# Export data ke file sementara, ditulis per chunk
+def export_dataframe(df, export_format):
+    """
+    Tulis df ke file sementara sesuai format (CSV/Parquet/XLSX) per chunk,
+    sehingga tidak ada buffer string / salinan penuh di memori.
+    Return file object (binary) yang terbuka; file sudah di-unlink sehingga
+    hilang dari disk begitu ditutup
+    """
+    suffix = EXPORT_FORMATS[export_format][0]
+    fd, path = tempfile.mkstemp(prefix='export_cc112_', suffix=suffix)
+    os.close(fd)
+
+    try:
+        if export_format == 'CSV':
+            with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+                for i, chunk in enumerate(iter_export_chunks(df)):
+                    chunk.to_csv(f, index=False, header=(i == 0))
+
+        elif export_format == 'Parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            # Schema sama untuk semua chunk (row group)
+            schema, string_cols = build_parquet_schema(df)
+            with pq.ParquetWriter(path, schema) as writer:
+                for chunk in iter_export_chunks(df):
+                    chunk = chunk.assign(**{
+                        c: chunk[c].astype(str).where(chunk[c].notna(), None) for c in string_cols
+                    })
+                    writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+        else:
+            from openpyxl import Workbook
+
+            # Mode write-only: baris langsung di-flush ke disk
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet('Data')
+            ws.append([str(c) for c in df.columns])
+            for chunk in iter_export_chunks(df):
+                # Period & NaN/NaT tidak didukung openpyxl
+                period_cols = [c for c in chunk.columns if isinstance(chunk[c].dtype, pd.PeriodDtype)]
+                chunk = chunk.astype({c: str for c in period_cols}).astype(object)
+                chunk = chunk.where(chunk.notna(), None)
+                for row in chunk.itertuples(index=False, name=None):
+                    ws.append(row)
+            wb.save(path)
+
+        return open(path, 'rb')
+
+    finally:
+        os.remove(path)
+
+# Sumber data download_button: export baru dibuat saat tombol diklik
+def export_data_callback(df, view, export_kecamatan, export_format):
+    """Return callable tanpa argumen yang membangun baris hasil filter lalu mengekspornya"""
+    def build_export():
+        df_export = rows_for_view(df, view)
+        if export_kecamatan != ALL_KECAMATAN_OPTION:
+            df_export = df_export[df_export['KECAMATAN'] == export_kecamatan]
+        return export_dataframe(df_export, export_format)
+
+    return build_export
 
 # Main app
 def main():
+    run_start = time.perf_counter()
+    get_startup_clock()
+
     st.title("📞 Dashboard Analisis Call Center 112")
     st.markdown("**Dashboard Interaktif untuk Mengeksplorasi Pola, Tren, dan Insight Data Laporan Call Center**")
     st.markdown("---")
     
     # Load data otomatis
+    dataset_version = get_dataset_version(PATH_2024, PATH_2025)
     with st.spinner('⏳ Memuat dan memproses data...'):
-        df, error = load_and_process_data(PATH_2024, PATH_2025)
+        df, dedup_report, error = load_and_process_data(PATH_2024, PATH_2025, dataset_version)
     
     if error:
         st.error(error)
@@ -166,11 +886,21 @@ def main():
     
     st.success(f"✅ Data berhasil dimuat! Total: {len(df):,} laporan")
     
-    # Sidebar - Filters
-    st.sidebar.header("🔍 Filter Data")
+    # Ringkasan deduplikasi per file sumber
+    total_duplicates = sum(dedup_report.values())
+    if total_duplicates > 0:
+        per_file = " · ".join(f"{os.path.basename(path)}: {n:,}" for path, n in dedup_report.items())
+        st.info(f"🧹 {total_duplicates:,} laporan duplikat dibuang ({per_file})")
     
     # Filter tahun
     years = sorted(df['source'].unique())
+
+    # Siapkan view default & chart default di background
+    start_prewarm(df, dataset_version, years)
+
+    # Sidebar - Filters
+    st.sidebar.header("🔍 Filter Data")
+    
     selected_years = st.sidebar.multiselect("Pilih Tahun", years, default=years)
     
     # Filter kategori (exclude "-" yang biasanya untuk ghost/prank)
@@ -180,7 +910,7 @@ def main():
         valid_categories = sorted([c for c in all_categories if c not in ['-', '', 'nan']])
         
         # Tambahkan opsi untuk data tanpa kategori (ghost/prank)
-        category_options = ['[Tanpa Kategori (Ghost/Prank)]'] + valid_categories
+        category_options = [NO_CATEGORY_OPTION] + valid_categories
         
         # Jika ada kategori valid, tampilkan filter
         if len(valid_categories) > 0:
@@ -203,7 +933,7 @@ def main():
         kecamatans_list = sorted(valid_kecamatans.unique())
         
         # Tambahkan opsi untuk data tanpa kecamatan
-        kecamatan_options = ['[Tanpa Lokasi (Ghost/Prank)]'] + kecamatans_list
+        kecamatan_options = [NO_LOCATION_OPTION] + kecamatans_list
         
         if len(kecamatans_list) > 0:
             selected_kecamatans = st.sidebar.multiselect(
@@ -217,47 +947,49 @@ def main():
     else:
         selected_kecamatans = []
     
-    # Apply filters
-    df_filtered = df.copy()
-    
-    if selected_years:
-        df_filtered = df_filtered[df_filtered['source'].isin(selected_years)]
-    
-    # Filter kategori
-    if selected_categories and len(selected_categories) > 0:
-        # Jika user pilih "[Tanpa Kategori]", ambil data dengan kategori "-"
-        if '[Tanpa Kategori (Ghost/Prank)]' in selected_categories:
-            # Ambil kategori normal yang dipilih
-            normal_cats = [c for c in selected_categories if c != '[Tanpa Kategori (Ghost/Prank)]']
-            # Filter: kategori "-" ATAU kategori yang dipilih
-            df_filtered = df_filtered[
-                (df_filtered['KATEGORI'].isin(['-', '']) | df_filtered['KATEGORI'].isna()) | 
-                (df_filtered['KATEGORI'].isin(normal_cats))
-            ]
-        else:
-            # Filter normal
-            df_filtered = df_filtered[df_filtered['KATEGORI'].isin(selected_categories)]
-    
-    # Filter kecamatan
-    if selected_kecamatans and len(selected_kecamatans) > 0:
-        # Jika user pilih "[Tanpa Lokasi]", ambil data dengan kecamatan "-"
-        if '[Tanpa Lokasi (Ghost/Prank)]' in selected_kecamatans:
-            # Ambil kecamatan normal yang dipilih
-            normal_kecs = [k for k in selected_kecamatans if k != '[Tanpa Lokasi (Ghost/Prank)]']
-            # Filter: kecamatan "-" ATAU kecamatan yang dipilih
-            df_filtered = df_filtered[
-                (df_filtered['KECAMATAN'].isin(['-', '']) | df_filtered['KECAMATAN'].isna()) | 
-                (df_filtered['KECAMATAN'].isin(normal_kecs))
-            ]
-        else:
-            # Filter normal
-            df_filtered = df_filtered[df_filtered['KECAMATAN'].isin(selected_kecamatans)]
-    
+    # Apply filters (hasil & agregat dibagi antar sesi lewat cache LRU)
+    filter_cache = get_filter_cache()
+    filter_key = canonical_filter_key(years, selected_years, selected_categories, selected_kecamatans, dataset_version)
+    view = filter_cache.get_or_compute(
+        filter_key,
+        lambda: compute_filter_view(df, filter_key),
+        estimate_view_nbytes
+    )
+
+    cache_stats = filter_cache.stats()
+    st.sidebar.caption(
+        f"⚡ Cache filter: {cache_stats['hits']:,} hit / {cache_stats['misses']:,} miss · "
+        f"{cache_stats['entries']} entri · {cache_stats['nbytes'] / 1024 ** 2:.0f} MB"
+    )
+
     # Warning jika data kosong setelah filter
-    if len(df_filtered) == 0:
+    if view['total'] == 0:
         st.warning("⚠️ Tidak ada data yang sesuai dengan filter yang dipilih. Silakan ubah filter di sidebar.")
         return
     
+    # Sidebar - Export data hasil filter
+    st.sidebar.markdown("---")
+    st.sidebar.header("📥 Export Data")
+
+    export_format = st.sidebar.selectbox("Format File", list(EXPORT_FORMATS))
+
+    # Drill-down: batasi export ke satu kecamatan (opsional)
+    export_kecamatan = ALL_KECAMATAN_OPTION
+    if 'kecamatan_counts' in view:
+        drilldown_options = [ALL_KECAMATAN_OPTION] + sorted(view['kecamatan_counts'].index)
+        export_kecamatan = st.sidebar.selectbox("Drill-down Kecamatan (opsional)", drilldown_options)
+
+    # File export hanya dibuat saat tombol diklik (callable dijalankan
+    # Streamlit di luar script run), tidak disimpan di session_state
+    ext, mime = EXPORT_FORMATS[export_format]
+    st.sidebar.download_button(
+        "⬇️ Download Data",
+        data=export_data_callback(df, view, export_kecamatan, export_format),
+        file_name=f"laporan_call_center_112{ext}",
+        mime=mime,
+        on_click="ignore"
+    )
+
     # Tabs untuk navigasi
     tab1, tab2, tab3, tab4, tab5 = st.tabs([
         "📊 Overview", 
@@ -275,21 +1007,22 @@ def main():
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Total Laporan", f"{len(df_filtered):,}")
+            st.metric("Total Laporan", f"{view['total']:,}")
+            record_first_metric(run_start)
         
         with col2:
-            ghost_count = int(df_filtered['ghost_call'].sum())
-            ghost_pct = (ghost_count / len(df_filtered) * 100) if len(df_filtered) > 0 else 0
+            ghost_count = view['flag_counts']['ghost_call']
+            ghost_pct = (ghost_count / view['total'] * 100) if view['total'] > 0 else 0
             st.metric("Ghost Calls", f"{ghost_count:,}", f"{ghost_pct:.1f}%")
         
         with col3:
-            prank_count = int(df_filtered['prank_call'].sum())
-            prank_pct = (prank_count / len(df_filtered) * 100) if len(df_filtered) > 0 else 0
+            prank_count = view['flag_counts']['prank_call']
+            prank_pct = (prank_count / view['total'] * 100) if view['total'] > 0 else 0
             st.metric("Prank Calls", f"{prank_count:,}", f"{prank_pct:.1f}%")
         
         with col4:
-            short_count = int(df_filtered['short_call'].sum())
-            short_pct = (short_count / len(df_filtered) * 100) if len(df_filtered) > 0 else 0
+            short_count = view['flag_counts']['short_call']
+            short_pct = (short_count / view['total'] * 100) if view['total'] > 0 else 0
             st.metric("Short Calls (≤5s)", f"{short_count:,}", f"{short_pct:.1f}%")
         
         st.markdown("---")
@@ -298,13 +1031,13 @@ def main():
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            fake_loc_count = int(df_filtered['fake_location'].sum())
-            fake_loc_pct = (fake_loc_count / len(df_filtered) * 100) if len(df_filtered) > 0 else 0
+            fake_loc_count = view['flag_counts']['fake_location']
+            fake_loc_pct = (fake_loc_count / view['total'] * 100) if view['total'] > 0 else 0
             st.metric("Lokasi Palsu", f"{fake_loc_count:,}", f"{fake_loc_pct:.1f}%")
         
         with col2:
-            rapid_count = int(df_filtered['rapid_repeat'].sum())
-            rapid_pct = (rapid_count / len(df_filtered) * 100) if len(df_filtered) > 0 else 0
+            rapid_count = view['flag_counts']['rapid_repeat']
+            rapid_pct = (rapid_count / view['total'] * 100) if view['total'] > 0 else 0
             st.metric("Spam Berulang (<2 menit)", f"{rapid_count:,}", f"{rapid_pct:.1f}%")
         
         st.markdown("---")
@@ -314,8 +1047,8 @@ def main():
         
         with col1:
             st.subheader("📋 Top 10 Kategori Laporan")
-            if 'KATEGORI' in df_filtered.columns:
-                category_counts = df_filtered['KATEGORI'].value_counts().head(10)
+            if 'category_counts' in view:
+                category_counts = view['category_counts']
                 
                 if len(category_counts) > 0:
                     fig, ax = plt.subplots(figsize=(10, 6))
@@ -330,7 +1063,7 @@ def main():
         
         with col2:
             st.subheader("📊 Top 10 Tipe Laporan")
-            tipe_counts = df_filtered['TIPE LAPORAN'].value_counts().head(10)
+            tipe_counts = view['tipe_counts']
             
             if len(tipe_counts) > 0:
                 fig, ax = plt.subplots(figsize=(10, 6))
@@ -349,6 +1082,10 @@ def main():
             else:
                 st.info("Tidak ada data tipe laporan untuk ditampilkan.")
     
+    # Deret waktu (tanpa filter), dihitung sekali per versi dataset.
+    # Diambil setelah tab Overview agar tidak menunda metrik pertama
+    time_series = compute_time_series(df, dataset_version)
+
     # ==================== TAB 2: POLA WAKTU ====================
     with tab2:
         st.header("📈 Analisis Pola Waktu")
@@ -356,8 +1093,8 @@ def main():
         # Pola Bulanan
         st.subheader("📅 Pola Bulanan (2024 vs 2025)")
         
-        monthly_2024 = df[df['source'] == '2024']['ym'].value_counts().sort_index()
-        monthly_2025 = df[df['source'] == '2025']['ym'].value_counts().sort_index()
+        monthly_2024 = time_series['monthly_2024']
+        monthly_2025 = time_series['monthly_2025']
         
         if len(monthly_2024) > 0 or len(monthly_2025) > 0:
             fig, ax = plt.subplots(figsize=(14, 6))
@@ -385,7 +1122,7 @@ def main():
         
         with col1:
             st.subheader("Pola Harian 2024")
-            daily_2024 = df[df['source'] == '2024']['date'].value_counts().sort_index()
+            daily_2024 = time_series['daily_2024']
             
             if len(daily_2024) > 0:
                 fig, ax = plt.subplots(figsize=(12, 6))
@@ -402,7 +1139,7 @@ def main():
         
         with col2:
             st.subheader("Pola Harian 2025")
-            daily_2025 = df[df['source'] == '2025']['date'].value_counts().sort_index()
+            daily_2025 = time_series['daily_2025']
             
             if len(daily_2025) > 0:
                 fig, ax = plt.subplots(figsize=(12, 6))
@@ -424,7 +1161,7 @@ def main():
         
         with col1:
             st.subheader("🕐 Pola Jam (2024)")
-            hourly_2024 = df[df['source'] == '2024']['hour'].value_counts().sort_index()
+            hourly_2024 = time_series['hourly_2024']
             
             if len(hourly_2024) > 0:
                 fig, ax = plt.subplots(figsize=(10, 6))
@@ -440,7 +1177,7 @@ def main():
         
         with col2:
             st.subheader("🕐 Pola Jam (2025)")
-            hourly_2025 = df[df['source'] == '2025']['hour'].value_counts().sort_index()
+            hourly_2025 = time_series['hourly_2025']
             
             if len(hourly_2025) > 0:
                 fig, ax = plt.subplots(figsize=(10, 6))
@@ -460,7 +1197,7 @@ def main():
         st.subheader("📆 Pola Berdasarkan Hari dalam Seminggu")
         
         weekday_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        weekday_counts = df_filtered['weekday'].value_counts().reindex(weekday_order)
+        weekday_counts = view['weekday_counts'].reindex(weekday_order)
         
         if len(weekday_counts.dropna()) > 0:
             fig, ax = plt.subplots(figsize=(12, 6))
@@ -478,10 +1215,10 @@ def main():
     with tab3:
         st.header("📍 Analisis Berdasarkan Lokasi")
         
-        if 'KECAMATAN' in df_filtered.columns:
+        if 'kecamatan_counts' in view:
             st.subheader("🗺️ Top 15 Kecamatan dengan Laporan Terbanyak")
             
-            kecamatan_counts = df_filtered['KECAMATAN'].value_counts().head(15)
+            kecamatan_counts = view['kecamatan_counts'].head(15)
             
             if len(kecamatan_counts) > 0:
                 fig, ax = plt.subplots(figsize=(12, 8))
@@ -496,34 +1233,24 @@ def main():
             
             st.markdown("---")
             
-            # Tabel Detail per Kecamatan - TAMPILKAN SEMUA (tidak tergantung filter)
+            # Tabel Detail per Kecamatan - mengikuti filter sidebar
             st.subheader("📋 Detail Laporan per Kecamatan (Top 20)")
-            
-            # Gunakan data ASLI (df), bukan df_filtered
-            # Hanya ambil data dengan kecamatan valid (bukan "-" atau NaN)
-            df_valid_kec = df[(df['KECAMATAN'].notna()) & (df['KECAMATAN'] != '-')].copy()
-            
-            if len(df_valid_kec) > 0:
-                # Agregasi per kecamatan
-                kecamatan_detail = df_valid_kec.groupby('KECAMATAN').agg({
-                    'UID': 'count',
-                    'ghost_call': lambda x: (x == True).sum(),  # Hitung True value
-                    'prank_call': lambda x: (x == True).sum(),
-                    'short_call': lambda x: (x == True).sum(),
-                    'fake_location': lambda x: (x == True).sum()
-                }).rename(columns={
-                    'UID': 'Total Laporan',
-                    'ghost_call': 'Ghost Calls',
-                    'prank_call': 'Prank Calls',
-                    'short_call': 'Short Calls',
-                    'fake_location': 'Lokasi Palsu'
-                }).sort_values('Total Laporan', ascending=False).head(20)
-                
-                # Convert to int untuk display yang lebih bersih
-                kecamatan_detail = kecamatan_detail.astype(int)
-                
+
+            # Rollup dari index lokasi (dihitung sekali per versi dataset)
+            kecamatan_rollup = view['kecamatan_rollup']
+            kelurahan_rollup = view['kelurahan_rollup']
+
+            if len(kecamatan_rollup) > 0:
+                kecamatan_detail = kecamatan_rollup.head(20)
+
                 st.dataframe(kecamatan_detail, use_container_width=True)
-                
+
+                # Drill-down kecamatan → kelurahan
+                st.markdown("**🔽 Rincian per Kelurahan**")
+                for kecamatan in kecamatan_detail.index:
+                    with st.expander(f"{kecamatan} ({kecamatan_detail.loc[kecamatan, 'Total Laporan']:,} laporan)"):
+                        st.dataframe(kelurahan_rollup[kecamatan], use_container_width=True)
+
                 # Info tambahan dengan styling
                 st.markdown("---")
                 st.markdown("### ℹ️ Penjelasan Kolom Tabel")
@@ -550,9 +1277,9 @@ def main():
                 # Ringkasan ghost/prank
                 st.info(f"""
                 📊 **Data Tanpa Lokasi (Tidak Masuk Tabel):**  
-                • Ghost Calls: {int(df['ghost_call'].sum()):,} laporan (kecamatan: -)  
-                • Prank Calls: {int(df['prank_call'].sum()):,} laporan (kecamatan: -)  
-                • Total: {int(df['ghost_call'].sum()) + int(df['prank_call'].sum()):,} laporan tanpa data lokasi
+                • Ghost Calls: {view['flag_counts']['ghost_call']:,} laporan (kecamatan: -)  
+                • Prank Calls: {view['flag_counts']['prank_call']:,} laporan (kecamatan: -)  
+                • Total: {view['flag_counts']['ghost_call'] + view['flag_counts']['prank_call']:,} laporan tanpa data lokasi
                 """)
             else:
                 st.info("Tidak ada data kecamatan yang valid.")
@@ -565,8 +1292,8 @@ def main():
         col1, col2 = st.columns(2)
         
         with col1:
-            fake_loc_count = int(df_filtered['fake_location'].sum())
-            fake_loc_pct = (fake_loc_count / len(df_filtered) * 100) if len(df_filtered) > 0 else 0
+            fake_loc_count = view['flag_counts']['fake_location']
+            fake_loc_pct = (fake_loc_count / view['total'] * 100) if view['total'] > 0 else 0
             st.metric("Total Lokasi Palsu (Lat/Long = 0)", f"{fake_loc_count:,}", f"{fake_loc_pct:.2f}%")
             
             st.markdown("**Kemungkinan Penyebab:**")
@@ -578,8 +1305,8 @@ def main():
             """)
         
         with col2:
-            rapid_count = int(df_filtered['rapid_repeat'].sum())
-            rapid_pct = (rapid_count / len(df_filtered) * 100) if len(df_filtered) > 0 else 0
+            rapid_count = view['flag_counts']['rapid_repeat']
+            rapid_pct = (rapid_count / view['total'] * 100) if view['total'] > 0 else 0
             st.metric("Spam Berulang (<2 menit)", f"{rapid_count:,}", f"{rapid_pct:.2f}%")
             
             st.markdown("**Kemungkinan Penyebab:**")
@@ -597,8 +1324,8 @@ def main():
         # Tren Ghost & Prank Call
         st.subheader("📉 Tren Ghost & Prank Call per Bulan")
         
-        ghost_monthly = df[df['ghost_call']].groupby('ym').size()
-        prank_monthly = df[df['prank_call']].groupby('ym').size()
+        ghost_monthly = time_series['ghost_monthly']
+        prank_monthly = time_series['prank_monthly']
         
         if len(ghost_monthly) > 0 or len(prank_monthly) > 0:
             fig, ax = plt.subplots(figsize=(14, 6))
@@ -661,10 +1388,10 @@ def main():
     with tab5:
         st.header("👤 Analisis Performa Agent")
         
-        if 'AGENT L1' in df_filtered.columns:
+        if 'agent_counts' in view:
             st.subheader("🏆 Top 15 Agent Berdasarkan Jumlah Laporan Ditangani")
             
-            agent_counts = df_filtered['AGENT L1'].value_counts().head(15)
+            agent_counts = view['agent_counts']
             
             if len(agent_counts) > 0:
                 fig, ax = plt.subplots(figsize=(12, 8))
@@ -684,10 +1411,8 @@ def main():
             
             with col1:
                 st.subheader("👻 Top 10 Agent Penangan Ghost Call")
-                ghost_df = df_filtered[df_filtered['ghost_call'] == True]
-                
-                if len(ghost_df) > 0:
-                    ghost_by_agent = ghost_df['AGENT L1'].value_counts().head(10)
+                if view['flag_counts']['ghost_call'] > 0:
+                    ghost_by_agent = view['ghost_by_agent']
                     
                     if len(ghost_by_agent) > 0:
                         fig, ax = plt.subplots(figsize=(10, 6))
@@ -705,10 +1430,8 @@ def main():
             
             with col2:
                 st.subheader("🎭 Top 10 Agent Penangan Prank Call")
-                prank_df = df_filtered[df_filtered['prank_call'] == True]
-                
-                if len(prank_df) > 0:
-                    prank_by_agent = prank_df['AGENT L1'].value_counts().head(10)
+                if view['flag_counts']['prank_call'] > 0:
+                    prank_by_agent = view['prank_by_agent']
                     
                     if len(prank_by_agent) > 0:
                         fig, ax = plt.subplots(figsize=(10, 6))
@@ -729,30 +1452,11 @@ def main():
             # Tabel Detail Performa Agent
             st.subheader("📊 Detail Performa Agent")
             
-            agent_detail = df_filtered.groupby('AGENT L1').agg({
-                'UID': 'count',
-                'ghost_call': 'sum',
-                'prank_call': 'sum',
-                'short_call': 'sum',
-                'duration_seconds': 'mean'
-            }).rename(columns={
-                'UID': 'Total Laporan',
-                'ghost_call': 'Ghost Calls',
-                'prank_call': 'Prank Calls',
-                'short_call': 'Short Calls',
-                'duration_seconds': 'Rata-rata Durasi (detik)'
-            }).sort_values('Total Laporan', ascending=False).head(20)
-            
-            # Convert to int kecuali durasi
-            for col in ['Ghost Calls', 'Prank Calls', 'Short Calls']:
-                agent_detail[col] = agent_detail[col].astype(int)
-            
-            # Format durasi
-            agent_detail['Rata-rata Durasi (detik)'] = agent_detail['Rata-rata Durasi (detik)'].round(2)
-            
-            st.dataframe(agent_detail, use_container_width=True)
+            st.dataframe(view['agent_detail'], use_container_width=True)
         else:
             st.warning("Kolom 'AGENT L1' tidak ditemukan dalam data.")
 
 if __name__ == "__main__":
+    if '--prewarm' in sys.argv:
+        sys.exit(prewarm_dataset())
     main()